@@ -0,0 +1,94 @@
+# cache.py
+
+import os
+import json
+import time
+import hashlib
+import functools
+import pandas as pd
+
+CACHE_DIR = '.cache'
+
+def _cache_key(func_name, args, kwargs):
+    """
+    Builds a stable filename-safe key from the function name and call arguments.
+    """
+    raw = repr((func_name, args, sorted(kwargs.items())))
+    return hashlib.md5(raw.encode()).hexdigest()
+
+def _is_empty(result):
+    """
+    Checks whether a result is missing data (empty list, empty DataFrame,
+    or a dict with any empty DataFrame); such results are not cached, so a
+    partial failure is never pinned for the TTL.
+    """
+    if isinstance(result, pd.DataFrame):
+        return result.empty
+    if isinstance(result, dict):
+        return any(isinstance(v, pd.DataFrame) and v.empty for v in result.values())
+    return not result
+
+def _write_payload(path_base, result):
+    """
+    Serializes a result to disk and returns the payload kind for the metadata.
+    DataFrames go to Parquet, everything else to JSON.
+    """
+    if isinstance(result, pd.DataFrame):
+        result.to_parquet(f'{path_base}.parquet')
+        return 'dataframe'
+    if isinstance(result, dict) and all(isinstance(v, pd.DataFrame) for v in result.values()):
+        os.makedirs(path_base, exist_ok=True)
+        for name, df in result.items():
+            df.to_parquet(os.path.join(path_base, f'{name}.parquet'))
+        return 'dataframe_dict'
+    with open(f'{path_base}.json', 'w') as f:
+        json.dump(result, f)
+    return 'json'
+
+def _read_payload(path_base, kind):
+    """
+    Deserializes a previously cached result based on its payload kind.
+    """
+    if kind == 'dataframe':
+        return pd.read_parquet(f'{path_base}.parquet')
+    if kind == 'dataframe_dict':
+        return {
+            os.path.splitext(filename)[0]: pd.read_parquet(os.path.join(path_base, filename))
+            for filename in sorted(os.listdir(path_base))
+        }
+    with open(f'{path_base}.json') as f:
+        return json.load(f)
+
+def cached(ttl):
+    """
+    Decorator that caches a function's result on disk under CACHE_DIR for
+    `ttl` seconds, keyed by the function name and call arguments. Repeat
+    calls within the TTL skip the network entirely and deserialize locally.
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            key = _cache_key(func.__name__, args, kwargs)
+            path_base = os.path.join(CACHE_DIR, f'{func.__name__}_{key}')
+            meta_path = f'{path_base}.meta.json'
+            if os.path.exists(meta_path):
+                try:
+                    with open(meta_path) as f:
+                        meta = json.load(f)
+                    if time.time() - meta['created'] < ttl:
+                        return _read_payload(path_base, meta['kind'])
+                except (OSError, ValueError, KeyError) as e:
+                    print(f"Cache read failed for {func.__name__}: {e}")
+            result = func(*args, **kwargs)
+            # Don't pin empty results (e.g. transient API failures) for the TTL
+            if not _is_empty(result):
+                try:
+                    os.makedirs(CACHE_DIR, exist_ok=True)
+                    kind = _write_payload(path_base, result)
+                    with open(meta_path, 'w') as f:
+                        json.dump({'kind': kind, 'created': time.time()}, f)
+                except (OSError, ValueError) as e:
+                    print(f"Cache write failed for {func.__name__}: {e}")
+            return result
+        return wrapper
+    return decorator
@@ -2,16 +2,44 @@
 
 import os
 import time
+import logging
+import concurrent.futures
+import orjson
 import requests
 import pandas as pd
+from pandas.api.types import is_datetime64_any_dtype
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from dotenv import load_dotenv
 from langchain.schema import Document
+from cache import cached
 
 # Load environment variables
 load_dotenv()
 FMP_API_KEY = os.getenv('FMP_API_KEY')
 SERPAPI_API_KEY = os.getenv('SERPAPI_API_KEY')
 
+log = logging.getLogger(__name__)
+
+# Key financial metrics to include per statement type; the schema is fixed
+# by the FMP endpoint, so there is no need to sniff columns per row
+KEY_METRICS = {
+    'income_statement': ['revenue', 'netIncome', 'eps'],
+    'balance_sheet': ['totalAssets', 'totalLiabilities', 'totalStockholdersEquity'],
+    'cash_flow': ['operatingCashFlow', 'capitalExpenditure', 'freeCashFlow']
+}
+
+# Shared session with connection pooling and retries, so repeated calls to
+# the same API host reuse TCP/TLS connections instead of reconnecting.
+# requests.Session is thread-safe for concurrent GETs via the pool.
+_session = requests.Session()
+_session.mount('https://', HTTPAdapter(
+    pool_connections=8,
+    pool_maxsize=16,
+    max_retries=Retry(total=3, backoff_factor=0.3)
+))
+
+@cached(ttl=3600)
 def get_company_news(company_name, num_results=5):
     """
     Fetches recent news articles related to the specified company using SerpAPI.
@@ -24,18 +52,26 @@ def get_company_news(company_name, num_results=5):
         'api_key': SERPAPI_API_KEY
     }
     try:
-        response = requests.get('https://serpapi.com/search', params=params)
+        # Separate connect/read timeouts bound the worst case; a hung SerpAPI
+        # response must not stall the whole fetch stage
+        response = _session.get('https://serpapi.com/search', params=params,
+                                timeout=(3.05, 10))
         response.raise_for_status()
-        data = response.json()
+        # orjson parses the response bytes several times faster than stdlib json
+        data = orjson.loads(response.content)
         if 'error' in data:
             print(f"SERPAPI error: {data['error']}")
             return []
         else:
             return data.get('news_results', [])
-    except requests.exceptions.RequestException as e:
+    except requests.exceptions.Timeout:
+        print("SERPAPI request timed out.")
+        return []
+    except (requests.exceptions.RequestException, orjson.JSONDecodeError) as e:
         print(f"Request exception: {e}")
         return []
 
+@cached(ttl=86400)
 def get_stock_data(ticker_symbol, period='1mo', interval='1d'):
     """
     Retrieves historical stock data for the specified ticker symbol using yfinance.
@@ -53,22 +89,19 @@ def get_stock_data(ticker_symbol, period='1mo', interval='1d'):
         else:
             # Reset index to make 'Date' a column
             df.reset_index(inplace=True)
-            # Ensure 'Date' is in datetime format
-            df['Date'] = pd.to_datetime(df['Date'], errors='coerce')
+            # yfinance already returns a datetime index; only re-parse the
+            # column if it somehow came back untyped
+            if not is_datetime64_any_dtype(df['Date']):
+                df['Date'] = pd.to_datetime(df['Date'], errors='coerce')
             # Drop rows with NaT in 'Date' column
             df.dropna(subset=['Date'], inplace=True)
-            # Get the last available date in the data
-            last_available_date = df['Date'].max()
-            # Filter data up to the last available date
-            df = df[df['Date'] <= last_available_date]
-            # Print sample data
-            print("\nSample Stock Data:")
-            print(df.head())
+            log.debug("Sample stock data:\n%s", df.head())
             return df
     except Exception as e:
         print(f"Exception while fetching stock data: {e}")
         return pd.DataFrame()
 
+@cached(ttl=86400)
 def get_financial_statements(ticker_symbol):
     """
     Fetches financial statements (income statement, balance sheet, cash flow) from the FMP API.
@@ -80,51 +113,65 @@ def get_financial_statements(ticker_symbol):
         'balance_sheet': f'{base_url}/balance-sheet-statement/{ticker_symbol.upper()}?apikey={FMP_API_KEY}&limit=5',
         'cash_flow': f'{base_url}/cash-flow-statement/{ticker_symbol.upper()}?apikey={FMP_API_KEY}&limit=5'
     }
-    for statement_type, url in endpoints.items():
-        try:
-            response = requests.get(url)
-            response.raise_for_status()
-            data = response.json()
-            # Print raw data for debugging
-            print(f"\nRaw data for {statement_type}:\n{data}\n")
-            if data:
-                df = pd.DataFrame(data)
-                # Convert 'date' column to datetime
-                df['date'] = pd.to_datetime(df['date'], errors='coerce')
-                # Drop rows with NaT in 'date' column
-                df.dropna(subset=['date'], inplace=True)
-                # Get the last available date in the data
-                last_available_date = df['date'].max()
-                # Filter data up to the last available date
-                df = df[df['date'] <= last_available_date]
-                if df.empty:
-                    print(f"No valid data found for {statement_type}")
-                    financial_statements[statement_type] = pd.DataFrame()
+    # Fetch all three statements concurrently; the work is pure network I/O,
+    # so total wall time becomes ~max(RTT) instead of sum(RTT)
+    with concurrent.futures.ThreadPoolExecutor(max_workers=3) as executor:
+        futures = {
+            executor.submit(_session.get, url, timeout=(3.05, 10)): statement_type
+            for statement_type, url in endpoints.items()
+        }
+        for future in concurrent.futures.as_completed(futures):
+            statement_type = futures[future]
+            try:
+                response = future.result()
+                response.raise_for_status()
+                data = orjson.loads(response.content)
+                log.debug("Raw data for %s:\n%s", statement_type, data)
+                if data:
+                    df = pd.DataFrame.from_records(data)
+                    # Pin the metric columns to float64 up front; letting
+                    # inference produce object dtypes (ints mixed with None)
+                    # makes every downstream selection slower
+                    numeric_cols = {
+                        col: 'float64'
+                        for col in KEY_METRICS.get(statement_type, [])
+                        if col in df.columns
+                    }
+                    if numeric_cols:
+                        df = df.astype(numeric_cols)
+                    # Convert 'date' column to datetime
+                    df['date'] = pd.to_datetime(df['date'], errors='coerce')
+                    # Drop rows with NaT in 'date' column
+                    df.dropna(subset=['date'], inplace=True)
+                    if df.empty:
+                        print(f"No valid data found for {statement_type}")
+                        financial_statements[statement_type] = pd.DataFrame()
+                    else:
+                        financial_statements[statement_type] = df
                 else:
-                    financial_statements[statement_type] = df
-            else:
-                print(f"No data found for {statement_type}")
+                    print(f"No data found for {statement_type}")
+                    financial_statements[statement_type] = pd.DataFrame()
+            except (requests.exceptions.RequestException, orjson.JSONDecodeError) as e:
+                print(f"Request exception for {statement_type}: {e}")
                 financial_statements[statement_type] = pd.DataFrame()
-        except requests.exceptions.RequestException as e:
-            print(f"Request exception for {statement_type}: {e}")
-            financial_statements[statement_type] = pd.DataFrame()
     return financial_statements
 
 def prepare_news_documents(news_articles):
     """
     Converts the list of news articles into Document objects for processing.
     """
-    documents = []
-    for article in news_articles:
-        content = f"Title: {article.get('title')}\nSnippet: {article.get('snippet')}\nDate: {article.get('date')}\nLink: {article.get('link')}\n"
-        metadata = {
-            "source": "news",
-            "title": article.get('title'),
-            "date": article.get('date'),
-            "link": article.get('link')
-        }
-        documents.append(Document(page_content=content, metadata=metadata))
-    return documents
+    return [
+        Document(
+            page_content=f"Title: {article.get('title')}\nSnippet: {article.get('snippet')}\nDate: {article.get('date')}\nLink: {article.get('link')}\n",
+            metadata={
+                "source": "news",
+                "title": article.get('title'),
+                "date": article.get('date'),
+                "link": article.get('link')
+            }
+        )
+        for article in news_articles
+    ]
 
 def prepare_financial_documents(financial_statements):
     """
@@ -132,29 +179,27 @@ def prepare_financial_documents(financial_statements):
     """
     documents = []
     for statement_type, df in financial_statements.items():
-        if not df.empty:
-            for _, row in df.iterrows():
-                date = row.get('date', 'N/A').strftime('%Y-%m-%d')
-                content = f"{statement_type.replace('_', ' ').capitalize()} Report for {date}:\n"
-                # Select key financial metrics to include
-                if 'revenue' in row:
-                    key_metrics = row[['revenue', 'netIncome', 'eps']]
-                elif 'totalAssets' in row:
-                    key_metrics = row[['totalAssets', 'totalLiabilities', 'totalStockholdersEquity']]
-                elif 'operatingCashFlow' in row:
-                    key_metrics = row[['operatingCashFlow', 'capitalExpenditure', 'freeCashFlow']]
-                else:
-                    key_metrics = row
-                for col, value in key_metrics.items():
-                    if col != 'date':
-                        content += f"{col}: {value}\n"
-                metadata = {
-                    "source": statement_type,
-                    "date": date
-                }
-                documents.append(Document(page_content=content, metadata=metadata))
-        else:
+        if df.empty:
             print(f"No data available to prepare documents for {statement_type}")
+            continue
+        # Select key financial metrics to include, dispatched by statement type
+        metric_cols = [
+            col for col in KEY_METRICS.get(statement_type, df.columns)
+            if col in df.columns and col != 'date'
+        ]
+        title = statement_type.replace('_', ' ').capitalize()
+        # Format dates vectorized and iterate plain tuples; iterrows builds
+        # a fresh Series per row and is far slower
+        rows = df[['date'] + metric_cols].copy()
+        rows['date'] = rows['date'].dt.strftime('%Y-%m-%d')
+        for date, *values in rows.itertuples(index=False, name=None):
+            content = f"{title} Report for {date}:\n"
+            content += ''.join(f"{col}: {value}\n" for col, value in zip(metric_cols, values))
+            metadata = {
+                "source": statement_type,
+                "date": date
+            }
+            documents.append(Document(page_content=content, metadata=metadata))
     return documents
 
 def prepare_all_documents(news_articles, financial_statements):